@@ -5,6 +5,9 @@ Automatically detects the platform and creates appropriately named package
 """
 
 import os
+import functools
+import hashlib
+import re
 import sys
 import platform
 import subprocess
@@ -13,6 +16,17 @@ import zipfile
 import json
 from pathlib import Path
 
+# Files and directories left out of the package
+SKIP_RE = re.compile(r'(__pycache__|\.pyc$|\.pyo$|\.DS_Store|\.git|test_server\.py|build\.sh|\.req\.sha256$)')
+
+# Already-compressed formats that deflate can't shrink further; stored as-is.
+# Native libraries (.so/.dylib) compress well, so they are deflated.
+STORED_SUFFIXES = {'.whl', '.png'}
+
+# Level 1 deflate: build time matters more than a few % of package size
+COMPRESS_LEVEL = 1
+
+@functools.lru_cache(maxsize=1)
 def get_platform_suffix():
     """Determine platform suffix for the package"""
     system = platform.system().lower()
@@ -44,6 +58,17 @@ def clean_vendor_directory():
         print(f"Cleaning existing vendor directory...")
         shutil.rmtree(vendor_path)
 
+def requirements_hash():
+    """Hash requirements.txt together with the interpreter and platform it is installed for"""
+    digest = hashlib.sha256(Path('smh-huddle-recordings-mcpb/server/requirements.txt').read_bytes())
+    digest.update(f"{sys.version_info.major}.{sys.version_info.minor}-{get_platform_suffix()}".encode())
+    return digest.hexdigest()
+
+def vendor_is_current():
+    """Check whether the vendor directory was installed from the current requirements"""
+    hash_path = Path('smh-huddle-recordings-mcpb/server/vendor/.req.sha256')
+    return hash_path.exists() and hash_path.read_text().strip() == requirements_hash()
+
 def install_dependencies():
     """Install platform-specific dependencies"""
     platform_suffix = get_platform_suffix()
@@ -57,6 +82,7 @@ def install_dependencies():
         sys.executable, '-m', 'pip', 'install',
         '--target', str(vendor_path),
         '--upgrade',
+        '--no-compile',
         '-r', 'smh-huddle-recordings-mcpb/server/requirements.txt'
     ], capture_output=True, text=True)
 
@@ -64,6 +90,8 @@ def install_dependencies():
         print(f"Warning: pip install had issues: {result.stderr}")
         print("Continuing with build...")
     else:
+        # Record what was installed so unchanged requirements skip the next install
+        (vendor_path / '.req.sha256').write_text(requirements_hash())
         print(f"✓ Dependencies installed to {vendor_path}")
 
 def update_manifest_version():
@@ -104,9 +132,10 @@ def create_package():
         os.remove(package_name)
 
     # Create zip file
-    with zipfile.ZipFile(package_name, 'w', zipfile.ZIP_DEFLATED) as zipf:
+    with zipfile.ZipFile(package_name, 'w', zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as zipf:
         # Walk through the source directory
         source_dir = Path('smh-huddle-recordings-mcpb')
+        files = []
 
         for file_path in source_dir.rglob('*'):
             # Skip directories and unwanted files
@@ -117,16 +146,18 @@ def create_package():
             relative_path = file_path.relative_to(source_dir)
 
             # Skip unwanted files
-            path_str = str(relative_path)
-            if any(skip in path_str for skip in [
-                '__pycache__', '.pyc', '.pyo', '.DS_Store',
-                '.git', 'test_server.py', 'build.sh'
-            ]):
+            if SKIP_RE.search(str(relative_path)):
                 continue
 
-            # Add file to zip
-            zipf.write(file_path, relative_path)
-            print(f"  Added: {relative_path}")
+            files.append((file_path, relative_path))
+
+        # Add files to zip
+        for file_path, relative_path in files:
+            if file_path.suffix in STORED_SUFFIXES:
+                zipf.write(file_path, relative_path, compress_type=zipfile.ZIP_STORED)
+            else:
+                zipf.write(file_path, relative_path)
+        print(f"  Added {len(files)} files")
 
     # Get file size
     file_size = os.path.getsize(package_name)
@@ -153,9 +184,12 @@ def main():
         sys.exit(1)
 
     try:
-        # Clean and install dependencies
-        clean_vendor_directory()
-        install_dependencies()
+        # Clean and install dependencies unless requirements are unchanged
+        if vendor_is_current():
+            print("✓ Vendor cache hit, requirements unchanged")
+        else:
+            clean_vendor_directory()
+            install_dependencies()
 
         # Update version
         version = update_manifest_version()
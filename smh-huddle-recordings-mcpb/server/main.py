@@ -9,8 +9,12 @@ import sys
 import json
 import logging
 import asyncio
-from typing import Any, Optional
-from datetime import datetime
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, AsyncIterator, Literal, Optional
+from datetime import datetime, timezone
 
 # Add vendor directory to Python path for bundled dependencies
 vendor_dir = os.path.join(os.path.dirname(__file__), 'vendor')
@@ -18,19 +22,35 @@ if os.path.exists(vendor_dir):
     sys.path.insert(0, vendor_dir)
 
 import httpx
+import msgspec
 from mcp.server.fastmcp import FastMCP
+from pydantic import Field, StringConstraints
 
 # Initialize logging
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
-logging.basicConfig(
-    level=logging.DEBUG if DEBUG else logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    stream=sys.stderr if DEBUG else open(os.devnull, 'w')
-)
+if DEBUG:
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+else:
+    # Discard log output without opening os.devnull or writing to it
+    logging.getLogger().addHandler(logging.NullHandler())
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close the shared HTTP client when the server shuts down"""
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("smh-huddle-recordings")
+mcp = FastMCP("smh-huddle-recordings", lifespan=lifespan)
 
 # Configuration with validation
 API_BASE_URL = os.getenv("API_BASE_URL")
@@ -52,14 +72,66 @@ logger.info(f"Initialized SMH Huddle Recordings server with API: {API_BASE_URL[:
 # HTTP client configuration
 DEFAULT_TIMEOUT = 30.0  # 30 seconds timeout for API calls
 MAX_RETRIES = 3
+MAX_BACKOFF = 30.0  # Upper bound for a single retry delay in seconds
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+MAX_BATCH_SIZE = 5  # Most recordings fetched by one get_recordings call
+
+# Responses are parsed by the MCP client, so only pretty-print when debugging
+JSON_INDENT = 2 if DEBUG else None
+
+# Tool parameter types; FastMCP validates these before a handler runs
+RecordingId = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+# Recording details cache (recordings don't change once ingested)
+RECORDING_CACHE_SIZE = 128
+RECORDING_CACHE_TTL = 3600.0  # 1 hour
+
+# Shared HTTP client so warm tool calls reuse pooled keep-alive connections
+# instead of paying a fresh TCP+TLS handshake every time. HTTP/2 multiplexes
+# concurrent calls over one connection; servers without h2 support are
+# negotiated down to HTTP/1.1 keep-alive via ALPN.
+http_client = httpx.AsyncClient(
+    base_url=API_BASE_URL,
+    headers={"X-API-Key": API_KEY},
+    timeout=httpx.Timeout(DEFAULT_TIMEOUT),
+    http2=True,
+    limits=httpx.Limits(
+        max_keepalive_connections=5,
+        max_connections=100,
+        keepalive_expiry=30.0
+    )
+)
+
+
+def retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """
+    Seconds to wait before retrying a failed request
+
+    Honors a numeric Retry-After header when the server sends one, otherwise
+    uses exponential backoff with jitter so concurrent callers don't retry
+    in lockstep.
+
+    Args:
+        attempt: Zero-based index of the attempt that failed
+        response: Error response, if the server returned one
+
+    Returns:
+        Delay in seconds, capped at MAX_BACKOFF
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(MAX_BACKOFF, float(retry_after))
+    return min(MAX_BACKOFF, 2 ** attempt + random.uniform(0, 0.5))
 
 
 async def make_api_request(
     method: str,
     endpoint: str,
     params: Optional[dict] = None,
-    timeout: float = DEFAULT_TIMEOUT
-) -> dict:
+    timeout: float = DEFAULT_TIMEOUT,
+    response_type: Any = msgspec.Raw
+) -> tuple[str, Any]:
     """
     Make an API request with proper error handling and retries
 
@@ -68,35 +140,33 @@ async def make_api_request(
         endpoint: API endpoint path
         params: Query parameters
         timeout: Request timeout in seconds
+        response_type: msgspec type the body is decoded into; the default
+            only validates the JSON without building Python objects
 
     Returns:
-        Parsed JSON response
+        Tuple of the raw response body and the body decoded as response_type
 
     Raises:
         Various exceptions with descriptive error messages
     """
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = {"X-API-Key": API_KEY}
-
-    logger.debug(f"Making {method} request to {url}")
+    logger.debug(f"Making {method} request to {endpoint}")
 
     for attempt in range(MAX_RETRIES):
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    params=params
-                )
-
-                # Check for successful response
-                response.raise_for_status()
-
-                # Parse and return JSON
-                data = response.json()
-                logger.debug(f"Request successful, received {len(str(data))} bytes")
-                return data
+            response = await http_client.request(
+                method=method,
+                url=endpoint,
+                params=params,
+                timeout=timeout
+            )
+
+            # Check for successful response
+            response.raise_for_status()
+            logger.debug(f"Request successful ({response.http_version}), received {len(response.content)} bytes")
+
+            # Validate the body; callers pass the raw text through unchanged
+            data = msgspec.json.decode(response.content, type=response_type)
+            return response.text, data
 
         except httpx.TimeoutException:
             logger.warning(f"Request timeout (attempt {attempt + 1}/{MAX_RETRIES})")
@@ -104,9 +174,15 @@ async def make_api_request(
                 raise Exception(f"Request timed out after {timeout} seconds. The API server may be slow or unreachable.")
 
         except httpx.HTTPStatusError as e:
+            # Retry throttling and gateway errors; other 4xx/5xx fail fast
+            if e.response.status_code in RETRYABLE_STATUS_CODES and attempt < MAX_RETRIES - 1:
+                logger.warning(f"API returned status {e.response.status_code} (attempt {attempt + 1}/{MAX_RETRIES})")
+                await asyncio.sleep(retry_delay(attempt, e.response))
+                continue
+
             error_msg = f"API returned error status {e.response.status_code}"
             try:
-                error_data = e.response.json()
+                error_data = msgspec.json.decode(e.response.content)
                 if "message" in error_data:
                     error_msg += f": {error_data['message']}"
             except:
@@ -119,7 +195,11 @@ async def make_api_request(
             if attempt == MAX_RETRIES - 1:
                 raise Exception(f"Failed to connect to API: {str(e)}")
 
-        except json.JSONDecodeError as e:
+        except msgspec.ValidationError as e:
+            logger.error(f"API response has an unexpected shape: {e}")
+            raise Exception(f"API returned an unexpected response: {e}")
+
+        except msgspec.DecodeError as e:
             logger.error(f"Failed to parse API response as JSON: {e}")
             raise Exception("API returned invalid JSON response")
 
@@ -129,16 +209,109 @@ async def make_api_request(
 
         # Wait before retry
         if attempt < MAX_RETRIES - 1:
-            await asyncio.sleep(2 ** attempt)  # Exponential backoff
+            await asyncio.sleep(retry_delay(attempt))
 
     raise Exception("Failed to complete request after all retries")
 
 
+# Usage hint attached to recordings that have a transcript
+USAGE_HINT = (
+    "Create summaries from the diarized transcript. "
+    "Format: Name, What was done, Problems, Plans, Agreements"
+)
+_USAGE_HINT_FIELD = ',"_usage_hint":' + msgspec.json.encode(USAGE_HINT).decode()
+
+
+class RecordingProbe(msgspec.Struct):
+    """Recording fields the server inspects; all other fields are skipped"""
+    # Kept raw so the transcript is never decoded into a Python string
+    transcript: msgspec.Raw = msgspec.Raw()
+
+
+# recording_id -> (fetched_at, response). Only touched from the event loop with
+# no await between lookup and update, so no lock is needed.
+_recording_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+# recording_id -> task fetching it, shared by concurrent callers
+_inflight: dict[str, asyncio.Task[str]] = {}
+
+
+async def _fetch_recording(recording_id: str) -> str:
+    """
+    Fetch recording details from the API and store them in the cache
+
+    Args:
+        recording_id: Unique identifier of the recording
+
+    Returns:
+        JSON string of the recording details with the usage hint attached
+    """
+    # Make API request with extended timeout for large transcripts
+    body, probe = await make_api_request(
+        "GET",
+        f"/recordings/{recording_id}",
+        params={"simplified": True},
+        timeout=60.0,  # Longer timeout for detailed recordings
+        response_type=RecordingProbe
+    )
+
+    # Add usage hint to response, appending it to the raw object instead of
+    # re-serializing it
+    if probe.transcript:
+        body = body.rstrip()[:-1] + _USAGE_HINT_FIELD + "}"
+
+    _recording_cache[recording_id] = (time.monotonic(), body)
+    _recording_cache.move_to_end(recording_id)
+    if len(_recording_cache) > RECORDING_CACHE_SIZE:
+        _recording_cache.popitem(last=False)
+
+    return body
+
+
+def _finish_inflight(recording_id: str, task: asyncio.Task) -> None:
+    """Drop a finished fetch from the in-flight map"""
+    _inflight.pop(recording_id, None)
+    # Mark the error as retrieved in case every caller was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+async def _fetch_recording_cached(recording_id: str) -> str:
+    """
+    Get recording details, serving repeat lookups from an in-memory LRU cache
+
+    Concurrent lookups of the same recording share a single API request.
+    Only successful responses are cached; errors propagate to every caller.
+
+    Args:
+        recording_id: Unique identifier of the recording
+
+    Returns:
+        JSON string of the recording details with the usage hint attached
+    """
+    cached = _recording_cache.get(recording_id)
+    if cached is not None and time.monotonic() - cached[0] < RECORDING_CACHE_TTL:
+        _recording_cache.move_to_end(recording_id)
+        logger.debug(f"Cache hit for recording {recording_id}")
+        return cached[1]
+
+    task = _inflight.get(recording_id)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_recording(recording_id))
+        _inflight[recording_id] = task
+        task.add_done_callback(lambda t: _finish_inflight(recording_id, t))
+    else:
+        logger.debug(f"Joining in-flight request for recording {recording_id}")
+
+    # Shield so one cancelled caller doesn't cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
 @mcp.tool()
 async def list_recordings(
-    skip: int = 0,
-    limit: int = 10,
-    period: Optional[str] = None
+    skip: Annotated[int, Field(ge=0)] = 0,
+    limit: Annotated[int, Field(ge=1, le=100)] = 10,
+    period: Optional[Literal["today", "week", "month"]] = None
 ) -> str:
     """
     Get a list of huddle (call) recordings
@@ -150,25 +323,12 @@ async def list_recordings(
     Args:
         skip: Number of recordings to skip for pagination (default: 0)
         limit: Number of recordings to return, max 100 (default: 10)
-        period: Optional time period filter (e.g., "today", "week", "month")
+        period: Optional time period filter ("today", "week" or "month")
 
     Returns:
         JSON string containing the list of recordings with metadata
     """
     try:
-        # Validate parameters
-        if skip < 0:
-            return json.dumps({
-                "error": "Invalid parameter",
-                "message": "skip must be non-negative"
-            })
-
-        if limit < 1 or limit > 100:
-            return json.dumps({
-                "error": "Invalid parameter",
-                "message": "limit must be between 1 and 100"
-            })
-
         # Build query parameters
         params = {
             "skip": skip,
@@ -181,24 +341,22 @@ async def list_recordings(
 
         logger.info(f"Fetching recordings list (skip={skip}, limit={limit}, period={period})")
 
-        # Make API request
-        data = await make_api_request("GET", "/recordings", params=params)
-
-        # Return formatted response
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        # Make API request; the validated body is returned as-is
+        body, _ = await make_api_request("GET", "/recordings", params=params)
+        return body
 
     except Exception as e:
         error_response = {
             "error": "Failed to fetch recordings",
             "message": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
         }
         logger.error(f"list_recordings failed: {e}")
-        return json.dumps(error_response, indent=2)
+        return json.dumps(error_response, indent=JSON_INDENT, ensure_ascii=False)
 
 
 @mcp.tool()
-async def get_recording(recording_id: str) -> str:
+async def get_recording(recording_id: RecordingId) -> str:
     """
     Get detailed information about a specific recording
 
@@ -210,6 +368,7 @@ async def get_recording(recording_id: str) -> str:
     - Agreements reached
 
     Note: Limit usage to ~7 calls per conversation for performance.
+    To fetch several recordings at once, use get_recordings.
 
     Args:
         recording_id: Unique identifier of the recording
@@ -218,43 +377,79 @@ async def get_recording(recording_id: str) -> str:
         JSON string containing full recording details and transcript
     """
     try:
-        # Validate recording ID
-        if not recording_id or not recording_id.strip():
-            return json.dumps({
-                "error": "Invalid parameter",
-                "message": "recording_id is required and cannot be empty"
-            })
-
-        recording_id = recording_id.strip()
         logger.info(f"Fetching recording details for ID: {recording_id}")
 
-        # Make API request with extended timeout for large transcripts
-        data = await make_api_request(
-            "GET",
-            f"/recordings/{recording_id}",
-            params={"simplified": True},
-            timeout=60.0  # Longer timeout for detailed recordings
-        )
-
-        # Add usage hint to response
-        if isinstance(data, dict) and "transcript" in data:
-            data["_usage_hint"] = (
-                "Create summaries from the diarized transcript. "
-                "Format: Name, What was done, Problems, Plans, Agreements"
-            )
-
-        # Return formatted response
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return await _fetch_recording_cached(recording_id)
 
     except Exception as e:
         error_response = {
             "error": "Failed to fetch recording",
             "message": str(e),
             "recording_id": recording_id,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
         }
         logger.error(f"get_recording failed for {recording_id}: {e}")
-        return json.dumps(error_response, indent=2)
+        return json.dumps(error_response, indent=JSON_INDENT, ensure_ascii=False)
+
+
+@mcp.tool()
+async def get_recordings(
+    recording_ids: Annotated[list[RecordingId], Field(min_length=1, max_length=MAX_BATCH_SIZE)]
+) -> str:
+    """
+    Get detailed information about several recordings at once
+
+    Same output per recording as get_recording, but all recordings are
+    fetched concurrently. Prefer this over repeated get_recording calls
+    when summarizing multiple huddles.
+
+    Note: Each recording counts toward the ~7 get_recording calls per
+    conversation; full transcripts are large, so only request the
+    recordings you need.
+
+    Args:
+        recording_ids: Unique identifiers of the recordings
+
+    Returns:
+        JSON array with the details of each distinct recording, in request
+        order; duplicate IDs are returned once. Recordings that could not be
+        fetched are replaced by an error object.
+    """
+    try:
+        # Drop duplicates, keeping request order
+        recording_ids = list(dict.fromkeys(recording_ids))
+        logger.info(f"Fetching recording details for IDs: {', '.join(recording_ids)}")
+
+        results = await asyncio.gather(
+            *(_fetch_recording_cached(recording_id) for recording_id in recording_ids),
+            return_exceptions=True
+        )
+
+        # Each result is already a JSON document, so join them without re-encoding
+        items = []
+        for recording_id, result in zip(recording_ids, results):
+            if isinstance(result, BaseException):
+                logger.error(f"get_recordings failed for {recording_id}: {result}")
+                items.append(json.dumps({
+                    "error": "Failed to fetch recording",
+                    "message": str(result),
+                    "recording_id": recording_id,
+                    "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
+                }, ensure_ascii=False))
+            else:
+                items.append(result)
+
+        return "[" + ",".join(items) + "]"
+
+    except Exception as e:
+        error_response = {
+            "error": "Failed to fetch recordings",
+            "message": str(e),
+            "recording_ids": recording_ids,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        }
+        logger.error(f"get_recordings failed: {e}")
+        return json.dumps(error_response, indent=JSON_INDENT, ensure_ascii=False)
 
 
 # Server startup